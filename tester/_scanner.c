@@ -0,0 +1,57 @@
+/*
+ * Optional native wordlist scanner, loaded by password_worker via ctypes.
+ *
+ * Build (Linux / macOS):
+ *     cc -O2 -shared -fPIC -o tester/_scanner.so tester/_scanner.c
+ * Build (Windows, MSVC):
+ *     cl /O2 /LD tester\_scanner.c /Fe:tester\_scanner.dll
+ *
+ * Without the compiled library the pure-Python mmap search is used.
+ */
+#include <stddef.h>
+#include <string.h>
+
+#ifdef _WIN32
+#define EXPORT __declspec(dllexport)
+#else
+#define EXPORT
+#endif
+
+/*
+ * Find the first line of `buf` equal to `pw` ("\n" or "\r\n" terminated,
+ * or running to the end of the buffer).
+ *
+ * Returns the offset of the matching line start, or -1 if there is none.
+ * `*lines_out` receives the 1-based number of the matching line, or the
+ * number of lines scanned when nothing matched.
+ */
+EXPORT long long scan_wordlist(const char *buf, size_t n,
+                               const char *pw, size_t m,
+                               size_t *lines_out)
+{
+    const char *p = buf;
+    const char *end = buf + n;
+    size_t lineno = 0;
+
+    while (p < end) {
+        /* memchr is vectorized in every mainstream libc */
+        const char *nl = memchr(p, '\n', (size_t)(end - p));
+        const char *eol = nl ? nl : end;
+        size_t len = (size_t)(eol - p);
+
+        if (len && p[len - 1] == '\r')
+            len--;
+        lineno++;
+
+        if (len == m && memcmp(p, pw, m) == 0) {
+            *lines_out = lineno;
+            return (long long)(p - buf);
+        }
+        if (!nl)
+            break;
+        p = nl + 1;
+    }
+
+    *lines_out = lineno;
+    return -1;
+}
@@ -4,8 +4,8 @@ from PyQt6.QtWidgets import (
     QVBoxLayout, QHBoxLayout, QPushButton,
     QLineEdit, QLabel, QRadioButton, QTextEdit, QCheckBox
 )
-from PyQt6.QtCore import Qt, QThread, QTimer
-from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import Qt, QThreadPool
+from PyQt6.QtGui import QIcon, QTextCursor
 from password_worker import PasswordWorker
 
 
@@ -20,15 +20,33 @@ def brute_force_exact(password: str, charset: str, guesses_per_second=100_000):
     N = len(charset)
     L = len(password)
 
-    # Total attempts before reaching passwords of the same length
-    attempts_before = sum(N**i for i in range(1, L))
+    # Total attempts before reaching passwords of the same length:
+    # N + N^2 + ... + N^(L-1), summed in closed form
+    if L <= 1:
+        attempts_before = 0
+    elif N == 1:
+        attempts_before = L - 1
+    else:
+        attempts_before = (N * (pow(N, L - 1) - 1)) // (N - 1)
 
     # Compute rank of given password within its length-space
+    if charset is DEFAULT_CHARSET:
+        # Map every byte to its charset position in one C-level pass
+        idxs = password.encode("utf-8").translate(_CHARSET_TBL)
+        if 255 in idxs:
+            bad = next(c for c in password if c not in _CHARSET_IDX)
+            raise ValueError(f"Character '{bad}' not in charset")
+    else:
+        index = {c: i for i, c in enumerate(charset)}
+        idxs = []
+        for c in password:
+            idx = index.get(c)
+            if idx is None:
+                raise ValueError(f"Character '{c}' not in charset")
+            idxs.append(idx)
+
     rank = 0
-    for c in password:
-        idx = charset.find(c)
-        if idx == -1:
-            raise ValueError(f"Character '{c}' not in charset")
+    for idx in idxs:
         rank = rank * N + idx
 
     # Total attempts = attempts of shorter lengths + rank position + 1
@@ -45,6 +63,11 @@ DEFAULT_CHARSET = (
     "!@#$%^&*()-_=+[{]}\\|;:'\",<.>/?`~ "
 )
 
+# Character -> position lookup for the default charset
+_CHARSET_IDX = {c: i for i, c in enumerate(DEFAULT_CHARSET)}
+# Same lookup as a bytes.translate table (255 marks bytes outside the charset)
+_CHARSET_TBL = bytes(_CHARSET_IDX.get(chr(b), 255) for b in range(256))
+
 
 # ======================================================
 # Main GUI class
@@ -66,8 +89,11 @@ class PasswordTester(QMainWindow):
 
         # ---- State variables ----
         self.scanning = False
-        self.thread = None
-        self.worker = None
+        self.workers = []
+
+        # Shared pool: wordlists are scanned concurrently, one per core
+        self.pool = QThreadPool.globalInstance()
+        self.pool.setMaxThreadCount(os.cpu_count() or 1)
 
         # ---- UI setup ----
         central_widget = QWidget()
@@ -172,6 +198,10 @@ class PasswordTester(QMainWindow):
         )
         self.console.setText("Password Tester Console Initialized...\n")
 
+        # Keep the console bounded: no undo history, oldest lines dropped
+        self.console.setUndoRedoEnabled(False)
+        self.console.document().setMaximumBlockCount(5000)
+
         # Add panels to main layout
         main_layout.addLayout(left_layout, 1)
         main_layout.addWidget(self.console, 2)
@@ -206,17 +236,18 @@ class PasswordTester(QMainWindow):
 
         # ---- Dictionary attack mode ----
         if self.dict_mode.isChecked():
-            self.wordlists = [
-                os.path.join(self.wordlists_dir, f)
-                for f in os.listdir(self.wordlists_dir)
-                if os.path.isfile(os.path.join(self.wordlists_dir, f))
-            ]
-            self.current_idx = 0
+            # Earlier workers may still be building indexes for later scans;
+            # keep those referenced so Abort / close can stop them
+            self.workers = [w for w in self.workers if not w.is_done()]
+
+            # DirEntry caches the file type from the directory read (no extra stat)
+            with os.scandir(self.wordlists_dir) as entries:
+                self.wordlists = [e.path for e in entries if e.is_file()]
             self.console.append(f"=== Starting dictionary scan for: '{self.password}' ===")
             self.result_label.setText("Scanning...")
             self.lists_total = 0
             self.matches_total = 0
-            self.start_next_wordlist()
+            self.start_wordlists()
 
         # ---- Brute-force simulation mode ----
         elif self.brute_mode.isChecked():
@@ -256,63 +287,80 @@ class PasswordTester(QMainWindow):
         self.scanning = False
         self.check_button.setText("Check Password")
 
-        try:
-            if self.worker and hasattr(self.worker, "stop"):
-                self.worker.stop()
-            if self.thread and self.thread.isRunning():
-                self.thread.quit()
-        except Exception:
-            pass
-
+        self.stop_workers()
         self.result_label.setText("Scan aborted by user.")
 
+    def stop_workers(self):
+        """Stop every worker (including background index builds) and ignore their output."""
+        for worker in self.workers:
+            try:
+                worker.stop()
+                worker.signals.progress.disconnect()
+                worker.signals.finished.disconnect()
+            except (RuntimeError, TypeError):
+                pass
+        self.workers = []
+
+    def closeEvent(self, event):
+        """Stop background work so the thread pool can shut down promptly."""
+        self.stop_workers()
+        super().closeEvent(event)
+
     # ======================================================
-    # Sequentially process each wordlist in separate threads
+    # Console output from workers
     # ======================================================
-    def start_next_wordlist(self):
-        """Launch scanning for the next wordlist file."""
-        if not self.scanning:
-            return
-
-        # All wordlists completed
-        if self.current_idx >= len(self.wordlists):
-            if self.matches_total > 0:
-                self.console.append(
-                    f"\n=== Scan finished. Matches found in {self.matches_total}/{self.lists_total} lists. ==="
-                )
-                self.result_label.setText(
-                    f"❌ Weak password (found in {self.matches_total}/{self.lists_total} lists)."
-                )
-            else:
-                self.console.append("\n=== Scan finished. No matches found. ===")
-                self.result_label.setText("✅ Not found in any wordlist.")
+    def append_console(self, text):
+        """Append a batch of worker progress lines as plain text."""
+        # Cheaper than append(): no rich-text detection, cursor stays at end
+        self.console.moveCursor(QTextCursor.MoveOperation.End)
+        self.console.insertPlainText("\n" + text)
 
-            self.scanning = False
-            self.check_button.setText("Check Password")
+    # ======================================================
+    # Dispatch all wordlists to the thread pool at once
+    # ======================================================
+    def start_wordlists(self):
+        """Launch one scanning worker per wordlist file."""
+        self._remaining = len(self.wordlists)
+        if not self._remaining:
+            self.finish_scan()
             return
 
-        # Prepare next dictionary file
-        path = self.wordlists[self.current_idx]
         delay = 0.001 if self.cinematic_checkbox.isChecked() else 0.0
         cinematic = self.cinematic_checkbox.isChecked()
 
-        self.console.append(f"\n--- Checking {os.path.basename(path)} ---")
+        for path in self.wordlists:
+            self.console.append(f"\n--- Checking {os.path.basename(path)} ---")
 
-        # Worker-thread setup
-        self.thread = QThread()
-        self.worker = PasswordWorker(self.password, path, delay=delay, cinematic=cinematic)
-        self.worker.moveToThread(self.thread)
+            # Worker setup
+            worker = PasswordWorker(self.password, path, delay=delay, cinematic=cinematic)
 
-        # Signal-slot connections
-        self.thread.started.connect(self.worker.run)
-        self.worker.progress.connect(self.console.append)
-        self.worker.finished.connect(self.on_worker_finished)
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
+            # Signal-slot connections
+            worker.signals.progress.connect(self.append_console)
+            worker.signals.finished.connect(self.on_worker_finished)
+
+            # Keep a reference so the scan can be aborted
+            self.workers.append(worker)
+            self.pool.start(worker)
+
+    # ======================================================
+    # All wordlists completed
+    # ======================================================
+    def finish_scan(self):
+        """Report the overall result once every wordlist is done."""
+        if self.matches_total > 0:
+            self.console.append(
+                f"\n=== Scan finished. Matches found in {self.matches_total}/{self.lists_total} lists. ==="
+            )
+            self.result_label.setText(
+                f"❌ Weak password (found in {self.matches_total}/{self.lists_total} lists)."
+            )
+        else:
+            self.console.append("\n=== Scan finished. No matches found. ===")
+            self.result_label.setText("✅ Not found in any wordlist.")
 
-        # Start next file processing
-        self.thread.start()
+        # Workers stay referenced: they may still be building indexes
+        self.scanning = False
+        self.check_button.setText("Check Password")
 
     # ======================================================
     # Worker finished callback
@@ -331,11 +379,12 @@ class PasswordTester(QMainWindow):
         else:
             self.console.append(f"Completed {filename} with no match. (time {elapsed:.2f}s)")
 
-        self.current_idx += 1
         self.lists_total += 1
 
-        # Delay before starting next list
-        QTimer.singleShot(3000, self.start_next_wordlist)
+        # Summarize once the last worker reports back
+        self._remaining -= 1
+        if self._remaining == 0:
+            self.finish_scan()
 
 
 # ======================================================
@@ -1,19 +1,128 @@
-from PyQt6.QtCore import QObject, pyqtSignal
-import os, time
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+import os, time, mmap, ctypes, threading
+from collections import OrderedDict
+from wordlist_index import (
+    BuildAborted, advise_sequential, build_bloom, build_bucket_index,
+    count_lines_before, iter_line_chunks, line_equals, open_bloom, open_bucket_index,
+)
 
 
-class PasswordWorker(QObject):
+# Bytes searched per step in condensed mode (progress / abort granularity)
+SCAN_CHUNK_BYTES = 4 * 1024 * 1024
+
+# Progress lines sent to the GUI per signal emission
+PROGRESS_BATCH_LINES = 256
+# Smaller batches when pacing output (~one frame at the default 1 ms delay)
+CINEMATIC_BATCH_LINES = 16
+
+# Lists larger than this are scanned in condensed mode (~50k typical lines)
+CONDENSED_BYTES_THRESHOLD = 512 * 1024
+
+# Lists up to this size are kept in memory as a hashed index between scans.
+# The index costs roughly 20x the file size in RAM, so both limits stay small.
+CACHE_MAX_BYTES = 16 * 1024 * 1024
+# Total wordlist bytes indexed at once; least recently used lists are evicted
+CACHE_BUDGET_BYTES = 32 * 1024 * 1024
+
+# Hashed wordlist indexes, least recently used first, keyed by path:
+#   path -> (mtime_ns, size, {word_bytes: first_line_number})
+WORDLIST_CACHE = OrderedDict()
+_cache_lock = threading.Lock()
+
+# Wordlists whose sidecar indexes are being built, so a later scan of
+# the same list does not start a second build alongside the first
+_BUILDING_PATHS = set()
+_building_lock = threading.Lock()
+
+
+def _load_index(path, mm, stat, keep_going):
     """
-    Worker class responsible for scanning a given wordlist file.
-    Runs in a separate thread to prevent blocking the GUI.
+    Return the cached word -> line number index for a wordlist,
+    (re)building it from the mapped file if missing or stale.
+
+    Args:
+        keep_going: Callable polled between chunks; the build stops
+            when it returns False.
+
+    Returns:
+        The index dict, or None if the build was aborted.
+    """
+    key = (stat.st_mtime_ns, stat.st_size)
+    with _cache_lock:
+        entry = WORDLIST_CACHE.get(path)
+        if entry is not None and entry[:2] == key:
+            WORDLIST_CACHE.move_to_end(path)
+            return entry[2]
+
+    advise_sequential(mm)
+    index, lineno = {}, 1
+    for lines in iter_line_chunks(mm):
+        if not keep_going():
+            return None
+        # Build each chunk from the end so the first occurrence of a word
+        # wins, then keep words already seen in earlier chunks
+        chunk = dict(zip(reversed(lines), range(lineno + len(lines) - 1, lineno - 1, -1)))
+        for word in chunk.keys() & index.keys():
+            del chunk[word]
+        index.update(chunk)
+        lineno += len(lines)
+
+    with _cache_lock:
+        WORDLIST_CACHE[path] = (*key, index)
+        WORDLIST_CACHE.move_to_end(path)
+        # Evict least recently used lists until the budget is met
+        while len(WORDLIST_CACHE) > 1 and (
+            sum(entry[1] for entry in WORDLIST_CACHE.values()) > CACHE_BUDGET_BYTES
+        ):
+            WORDLIST_CACHE.popitem(last=False)
+    return index
+
+
+def _load_native_scanner():
+    """
+    Load the optional compiled scanner (_scanner.c), if it has been built.
+
+    Returns:
+        The scan_wordlist function, or None to use the Python search.
+    """
+    suffix = ".dll" if os.name == "nt" else ".so"
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_scanner" + suffix)
+    try:
+        lib = ctypes.CDLL(path)
+    except OSError:
+        return None
+
+    scan = lib.scan_wordlist
+    scan.argtypes = [
+        ctypes.c_void_p, ctypes.c_size_t,
+        ctypes.c_char_p, ctypes.c_size_t,
+        ctypes.POINTER(ctypes.c_size_t),
+    ]
+    scan.restype = ctypes.c_longlong
+    return scan
+
+
+_native_scan = _load_native_scanner()
+
+
+class WorkerSignals(QObject):
+    """
+    Signals emitted by a PasswordWorker.
+    QRunnable is not a QObject, so the signals live on this helper.
     """
 
-    # ---- Signals ----
     progress = pyqtSignal(str)
     finished = pyqtSignal(str, bool, int, float)
     # Emits:
     #   (filename, found, line_number, elapsed_time)
 
+
+class PasswordWorker(QRunnable):
+    """
+    Worker class responsible for scanning a given wordlist file.
+    Runs on a QThreadPool thread to prevent blocking the GUI.
+    """
+
     def __init__(
         self,
         password: str,
@@ -31,83 +140,337 @@ class PasswordWorker(QObject):
             cinematic: Whether to show every attempted word.
         """
         super().__init__()
+        self.signals = WorkerSignals()
         self.password = password.strip()
+        self._target = self.password.encode("utf-8", "ignore")  # Compared as bytes
         self.wordlist_path = wordlist_path
+        self._base = os.path.basename(wordlist_path)  # Display name, used per line
         self.delay = delay
         self.cinematic = cinematic
         self._is_running = True  # Internal flag for abortion control
+        self._verbose = True  # Set per run from the wordlist size
+        self._needs_index = False  # Large list scanned without its sidecar indexes
+        self._done = False  # Set once the scan and any index build are over
 
     def run(self):
         """
         Primary execution method for wordlist scanning.
 
-        Reads the given wordlist line-by-line, compares against the
-        provided password, and emits progress messages along the way.
+        Memory-maps the given wordlist once and either walks it
+        line-by-line (cinematic / small lists) or searches the whole
+        buffer for the target line, emitting progress messages along
+        the way.
         """
         start_time = time.perf_counter()
         found, line_number = False, None
 
         try:
-            # Optionally pre-count total lines (used for throttling behavior)
-            total_lines = None
-            if not self.cinematic:
-                with open(self.wordlist_path, encoding="utf-8", errors="ignore") as f:
-                    total_lines = sum(1 for _ in f)
-
-            # Begin reading and matching process
-            with open(self.wordlist_path, encoding="utf-8", errors="ignore") as f:
-                for lineno, word in enumerate(f, start=1):
-                    if not self._is_running:
-                        break  # Early exit if scan aborted
-
-                    candidate = word.strip()
-                    is_match = self.password == candidate
-
-                    # ---- Cinematic / full output mode ----
-                    if self.cinematic or (total_lines and total_lines <= 50000):
-                        msg = (
-                            f'{os.path.basename(self.wordlist_path)} '
-                            f'Line {lineno} "{candidate}" - '
-                        )
-                        msg += "MATCH!" if is_match else "NO MATCH"
-                        self.progress.emit(msg)
-
-                        # Optional delay for visual pacing
-                        if self.delay > 0:
-                            time.sleep(self.delay)
-
-                    # ---- Condensed output mode ----
-                    else:
-                        if is_match:
-                            self.progress.emit(
-                                f'{os.path.basename(self.wordlist_path)} '
-                                f'Line {lineno} "{candidate}" - MATCH!'
-                            )
-                        elif lineno % 1000 == 0:
-                            # Emit periodic status every 1000 lines
-                            self.progress.emit(
-                                f"{os.path.basename(self.wordlist_path)} "
-                                f"Line {lineno} ... still scanning"
-                            )
-
-                    # If a match is found, stop scanning this list
-                    if is_match:
-                        found, line_number = True, lineno
-                        break
+            # File size decides the output mode; no line-counting pass needed
+            stat = os.stat(self.wordlist_path)
+            size = stat.st_size
+            self._verbose = self.cinematic or size <= CONDENSED_BYTES_THRESHOLD
+
+            fd = os.open(self.wordlist_path, os.O_RDONLY)
+            try:
+                # Widen kernel readahead: most paths read the list front to back
+                if hasattr(os, "posix_fadvise"):
+                    os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_SEQUENTIAL)
+
+                # Empty files cannot be mapped and never match
+                if size:
+                    with mmap.mmap(fd, 0, access=mmap.ACCESS_READ) as mm:
+                        if self._verbose:
+                            found, line_number = self._scan_lines(mm)
+                        elif size <= CACHE_MAX_BYTES:
+                            found, line_number = self._lookup_cached(mm, stat)
+                        else:
+                            found, line_number = self._lookup_large(mm, stat)
+            finally:
+                os.close(fd)
 
         except FileNotFoundError:
             # Handle missing file gracefully
-            self.progress.emit(f"ERROR: Wordlist not found: {self.wordlist_path}")
+            self.signals.progress.emit(f"ERROR: Wordlist not found: {self.wordlist_path}")
 
         # ---- Emit completion signal ----
         elapsed = time.perf_counter() - start_time
-        self.finished.emit(
-            os.path.basename(self.wordlist_path),
+        self.signals.finished.emit(
+            self._base,
             found,
             line_number,
             elapsed,
         )
 
+        # Index building is slow, so it runs only after the result is out
+        if self._needs_index and self._is_running:
+            self._build_indexes()
+        self._done = True
+
+    def _scan_lines(self, mm):
+        """
+        Cinematic / full output mode: report every attempted word.
+
+        Returns:
+            (found, line_number) tuple.
+        """
+        advise_sequential(mm)
+
+        # Lines are emitted in batches to cut cross-thread signal traffic
+        batch = CINEMATIC_BATCH_LINES if self.delay > 0 else PROGRESS_BATCH_LINES
+        buf = []
+
+        # Loop invariants, looked up once instead of per line
+        target, pace = self._target, self.delay > 0
+        fmt = self._base.replace("%", "%%") + ' Line %d "%s" - %s'
+
+        for lineno, word in enumerate(iter(mm.readline, b""), start=1):
+            if not self._is_running:
+                break  # Early exit if scan aborted
+
+            # Compare raw bytes; decode only for display
+            candidate = word.rstrip(b"\r\n")
+            is_match = candidate == target
+
+            buf.append(fmt % (
+                lineno,
+                candidate.decode("utf-8", "replace"),
+                "MATCH!" if is_match else "NO MATCH",
+            ))
+
+            # If a match is found, stop scanning this list
+            if is_match:
+                self.signals.progress.emit("\n".join(buf))
+                return True, lineno
+
+            if len(buf) >= batch:
+                self.signals.progress.emit("\n".join(buf))
+                buf.clear()
+
+            # Optional delay for visual pacing
+            if pace:
+                time.sleep(self.delay)
+
+        # Flush whatever is left of the last batch
+        if buf:
+            self.signals.progress.emit("\n".join(buf))
+        return False, None
+
+    def _lookup_cached(self, mm, stat):
+        """
+        Condensed output mode for lists that fit the in-memory cache.
+
+        The first scan of a list builds a hashed index of its words;
+        every later scan of the unchanged file is a single dict lookup.
+
+        Returns:
+            (found, line_number) tuple.
+        """
+        index = _load_index(self.wordlist_path, mm, stat, self._keep_going)
+        if index is None:
+            return False, None  # Build aborted
+
+        lineno = index.get(self._target)
+        if lineno is None:
+            return False, None
+
+        self._report_match(lineno)
+        return True, lineno
+
+    def _lookup_large(self, mm, stat):
+        """
+        Condensed output mode for lists too large to cache in memory.
+
+        A Bloom filter stored beside the wordlist answers the common
+        "not in this list" case with a few bit probes; a hit is settled
+        by binary search over the length bucket of a sorted word index.
+        Until both indexes exist it falls back to searching the mapped
+        file, and the indexes are built once the result is reported.
+
+        Returns:
+            (found, line_number) tuple.
+        """
+        bloom = open_bloom(self.wordlist_path, stat)
+        index = open_bucket_index(self.wordlist_path, stat)
+        if bloom is None or index is None:
+            for opened in (bloom, index):
+                if opened is not None:
+                    opened.close()
+            self._needs_index = True
+            return self._scan_buffer(mm)
+
+        with bloom:
+            if self._target not in bloom:
+                index.close()
+                return False, None
+
+        with index:
+            offset = index.find(self._target, mm)
+        if offset is None:
+            return False, None
+
+        lineno = count_lines_before(mm, offset)
+        self._report_match(lineno)
+        return True, lineno
+
+    def _build_indexes(self):
+        """
+        Build the missing sidecar indexes for this wordlist so later
+        scans can use them. Stops early when the worker is aborted;
+        a folder that cannot be written simply leaves the list unindexed.
+        Does nothing if another worker is already building this list.
+        """
+        with _building_lock:
+            if self.wordlist_path in _BUILDING_PATHS:
+                return
+            _BUILDING_PATHS.add(self.wordlist_path)
+
+        try:
+            stat = os.stat(self.wordlist_path)
+            with open(self.wordlist_path, "rb") as f, \
+                    mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                bloom = open_bloom(self.wordlist_path, stat)
+                if bloom is None:
+                    build_bloom(self.wordlist_path, mm, stat, self._keep_going)
+                else:
+                    bloom.close()
+
+                index = open_bucket_index(self.wordlist_path, stat)
+                if index is None:
+                    build_bucket_index(self.wordlist_path, mm, stat, self._keep_going)
+                else:
+                    index.close()
+        except (BuildAborted, OSError):
+            pass
+        finally:
+            with _building_lock:
+                _BUILDING_PATHS.discard(self.wordlist_path)
+
+    def _scan_buffer(self, mm):
+        """
+        Condensed output mode: search the mapped buffer for the target line.
+
+        The search runs chunk by chunk so that progress can be reported
+        and an abort request honoured; within a chunk the lookup is a
+        single C-level find for "\n<password>" instead of a Python loop
+        over every line; each hit is confirmed to end the line, whichever
+        line ending (LF or CRLF) that line uses.
+
+        Returns:
+            (found, line_number) tuple.
+        """
+        if _native_scan is not None:
+            return self._scan_native()
+        advise_sequential(mm)
+
+        target = self._target
+        size = mm.size()
+        needle = b"\n" + target
+
+        # The first line has no preceding newline to anchor on
+        if line_equals(mm, 0, target):
+            self._report_match(1)
+            return True, 1
+
+        pos, lineno = 0, 1  # lineno is the line number at offset `pos`
+        while pos < size:
+            if not self._is_running:
+                return False, None  # Early exit if scan aborted
+
+            end = min(pos + SCAN_CHUNK_BYTES, size)
+            limit = end + len(needle) - 1
+
+            # Skip hits that are only a prefix of a longer line
+            hit = mm.find(needle, pos, limit)
+            while hit != -1 and not line_equals(mm, hit + 1, target):
+                hit = mm.find(needle, hit + 1, limit)
+
+            if hit != -1:
+                # Matched line starts right after the leading newline
+                lineno += mm[pos:hit + 1].count(b"\n")
+                self._report_match(lineno)
+                return True, lineno
+
+            lineno += mm[pos:end].count(b"\n")
+            pos = end
+
+            # Emit periodic status once per chunk
+            self.signals.progress.emit(
+                f"{self._base} "
+                f"Line {lineno} ... still scanning"
+            )
+
+        return False, None
+
+    def _scan_native(self):
+        """
+        Condensed output mode using the compiled scanner.
+
+        Same chunked walk as _scan_buffer, but each line-aligned chunk is
+        matched in C, which also counts the lines it passes.
+
+        Returns:
+            (found, line_number) tuple.
+        """
+        lines = ctypes.c_size_t()
+
+        # ctypes can only take the address of a writable buffer, so the
+        # native path maps its own private (copy-on-write) view; the file
+        # is never written and the page cache is shared with other mappings
+        with open(self.wordlist_path, "rb") as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY) as view:
+            # Readahead hints are per mapping and per descriptor, so give
+            # them again for the view that is actually read
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            advise_sequential(view)
+
+            size = view.size()
+            base = ctypes.c_char.from_buffer(view)
+            try:
+                address = ctypes.addressof(base)
+                pos, lineno = 0, 0  # lineno counts the lines before offset `pos`
+                while pos < size:
+                    if not self._is_running:
+                        return False, None  # Early exit if scan aborted
+
+                    # Cut chunks on line boundaries
+                    end = view.find(b"\n", min(pos + SCAN_CHUNK_BYTES, size))
+                    end = size if end == -1 else end + 1
+
+                    hit = _native_scan(
+                        address + pos, end - pos,
+                        self._target, len(self._target),
+                        ctypes.byref(lines),
+                    )
+                    lineno += lines.value
+                    if hit != -1:
+                        self._report_match(lineno)
+                        return True, lineno
+                    pos = end
+
+                    # Emit periodic status once per chunk
+                    self.signals.progress.emit(
+                        f"{self._base} "
+                        f"Line {lineno} ... still scanning"
+                    )
+            finally:
+                # Release the exported buffer so the mapping can be closed
+                del base
+
+        return False, None
+
+    def _report_match(self, lineno):
+        """Emit the progress line announcing a match."""
+        self.signals.progress.emit(f'{self._base} Line {lineno} "{self.password}" - MATCH!')
+
+    def _keep_going(self):
+        """Polled by long-running builds; False once the worker is stopped."""
+        return self._is_running
+
+    def is_done(self):
+        """True once run() has returned, including any index build."""
+        return self._done
+
     def stop(self):
         """Safely request early termination of the worker loop."""
         self._is_running = False
\ No newline at end of file
@@ -0,0 +1,433 @@
+import os, mmap, struct, hashlib, heapq, shutil, tempfile
+from array import array
+from contextlib import contextmanager
+
+
+# Sidecar index files live next to the wordlists in this hidden folder
+INDEX_DIRNAME = ".index"
+
+# Bloom filter sizing (~1% false positives at 10 bits / 7 hashes per word)
+BLOOM_BITS_PER_ENTRY = 10
+BLOOM_HASHES = 7
+
+# Lines read per step while building an index (also the sort run size)
+BUILD_CHUNK_BYTES = 4 * 1024 * 1024
+# Merged bucket records buffered between writes / abort checks
+MERGE_FLUSH_RECORDS = 64 * 1024
+# Bytes read at a time from each sorted run while merging
+MERGE_READ_BYTES = 64 * 1024
+
+# Bloom file header: magic, bit count, hash count, source mtime_ns, source size
+_BLOOM_HEADER = struct.Struct("<8sQQqQ")
+_BLOOM_MAGIC = b"PWBLOOM1"
+
+# Bucket index header: magic, bucket count, source mtime_ns, source size,
+# followed by one directory entry per bucket: row width, row count, data offset
+_BUCKET_HEADER = struct.Struct("<8sQqQ")
+_BUCKET_ENTRY = struct.Struct("<QQQ")
+_BUCKET_MAGIC = b"PWBUCK02"
+
+# Words longer than this are stored as fingerprints of this many bytes
+FINGERPRINT_BYTES = 8
+
+
+class BuildAborted(Exception):
+    """Raised when an index build is stopped before it completes."""
+
+
+def index_path(wordlist_path, suffix):
+    """Return the sidecar path for a wordlist, e.g. wordlists/.index/list.txt.bloom"""
+    folder = os.path.join(os.path.dirname(wordlist_path), INDEX_DIRNAME)
+    return os.path.join(folder, os.path.basename(wordlist_path) + suffix)
+
+
+def fingerprint(word):
+    """64-bit blake2b fingerprint of a word, as bytes (sorts like the integer)."""
+    return hashlib.blake2b(word, digest_size=FINGERPRINT_BYTES).digest()
+
+
+def _row_size(width):
+    """Stored row size for words of `width` bytes."""
+    return FINGERPRINT_BYTES if width > FINGERPRINT_BYTES else width
+
+
+def line_equals(mm, start, target):
+    """Check whether the line beginning at `start` is exactly `target`."""
+    end = start + len(target)
+    if mm[start:end] != target:
+        return False
+    return end == mm.size() or mm[end:end + 1] == b"\n" or mm[end:end + 2] == b"\r\n"
+
+
+def advise_sequential(mm):
+    """
+    Hint the kernel that a mapping is about to be read front to back,
+    so it prefetches ahead instead of faulting pages in one by one.
+    No-op where madvise is unavailable (e.g. Windows).
+    """
+    if not hasattr(mm, "madvise"):
+        return
+    for name in ("MADV_SEQUENTIAL", "MADV_WILLNEED"):
+        if hasattr(mmap, name):
+            mm.madvise(getattr(mmap, name))
+
+
+def iter_line_chunks(mm, chunk_bytes=BUILD_CHUNK_BYTES):
+    """Yield lists of lines from a mapped wordlist, cut on line boundaries."""
+    pos, size = 0, mm.size()
+    while pos < size:
+        end = mm.find(b"\n", min(pos + chunk_bytes, size))
+        end = size if end == -1 else end + 1
+        yield mm[pos:end].splitlines()
+        pos = end
+
+
+def count_lines_before(mm, offset):
+    """Return the 1-based line number of the line starting at `offset`."""
+    lineno = 1
+    for pos in range(0, offset, BUILD_CHUNK_BYTES):
+        lineno += mm[pos:min(pos + BUILD_CHUNK_BYTES, offset)].count(b"\n")
+    return lineno
+
+
+@contextmanager
+def _atomic_file(path):
+    """
+    Yield a uniquely named temp file beside `path` that replaces `path`
+    only if the block completes, so readers never see half a file and
+    concurrent builders never share a temp file.
+    """
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=folder, prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            yield f
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+def _open_current(cls, wordlist_path, suffix, stat):
+    """
+    Open a sidecar index if it exists and matches the wordlist's
+    current mtime and size.
+
+    Returns:
+        The opened index, or None if missing, stale or unreadable.
+    """
+    try:
+        index = cls(index_path(wordlist_path, suffix))
+    except (OSError, ValueError, struct.error):
+        return None
+    if (index.mtime_ns, index.source_size) == (stat.st_mtime_ns, stat.st_size):
+        return index
+    index.close()
+    return None
+
+
+def _bloom_positions(word, bits, hashes):
+    """Bit positions for a word (double hashing over one blake2b digest)."""
+    digest = hashlib.blake2b(word, digest_size=16).digest()
+    h1 = int.from_bytes(digest[:8], "little")
+    h2 = int.from_bytes(digest[8:], "little") | 1
+    return [(h1 + i * h2) % bits for i in range(hashes)]
+
+
+class BloomFilter:
+    """
+    Memory-mapped Bloom filter over the words of one wordlist.
+
+    A negative answer is definite; a positive one may be a false
+    positive and must be confirmed against the wordlist itself.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.bits, self.hashes, self.mtime_ns, self.source_size = (
+            _BLOOM_HEADER.unpack_from(self._mm)
+        )
+        if magic != _BLOOM_MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a bloom index: {path}")
+        # A truncated file would otherwise fail (or read zeros) on lookup
+        if self.bits == 0 or self._mm.size() < _BLOOM_HEADER.size + (self.bits + 7) // 8:
+            self._mm.close()
+            raise ValueError(f"Truncated bloom index: {path}")
+
+    def __contains__(self, word):
+        mm, base = self._mm, _BLOOM_HEADER.size
+        return all(
+            mm[base + (p >> 3)] >> (p & 7) & 1
+            for p in _bloom_positions(word, self.bits, self.hashes)
+        )
+
+    def close(self):
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def build_bloom(wordlist_path, mm, stat, keep_going):
+    """
+    Stream the mapped wordlist into a Bloom filter and persist it.
+
+    Args:
+        keep_going: Callable polled between chunks; the build raises
+            BuildAborted when it returns False.
+
+    Returns:
+        Path of the written bloom file.
+    """
+    advise_sequential(mm)
+
+    # Size the filter from the line count (one C-level count per chunk)
+    entries = 0
+    for pos in range(0, mm.size(), BUILD_CHUNK_BYTES):
+        entries += mm[pos:pos + BUILD_CHUNK_BYTES].count(b"\n")
+    bits = max(64, (entries + 1) * BLOOM_BITS_PER_ENTRY)
+    table = bytearray((bits + 7) // 8)
+
+    for lines in iter_line_chunks(mm):
+        if not keep_going():
+            raise BuildAborted(wordlist_path)
+        for word in lines:
+            for p in _bloom_positions(word, bits, BLOOM_HASHES):
+                table[p >> 3] |= 1 << (p & 7)
+
+    path = index_path(wordlist_path, ".bloom")
+    with _atomic_file(path) as f:
+        f.write(_BLOOM_HEADER.pack(
+            _BLOOM_MAGIC, bits, BLOOM_HASHES, stat.st_mtime_ns, stat.st_size
+        ))
+        f.write(table)
+    return path
+
+
+def open_bloom(wordlist_path, stat):
+    """
+    Open the Bloom filter for a wordlist.
+
+    Returns:
+        BloomFilter, or None if it is missing or older than the wordlist
+        (see build_bloom).
+    """
+    return _open_current(BloomFilter, wordlist_path, ".bloom", stat)
+
+
+class BucketIndex:
+    """
+    Memory-mapped wordlist index bucketed by word length.
+
+    Each bucket stores its words as sorted fixed-width rows (no
+    separators) followed by a parallel array of line-start offsets into
+    the wordlist. Words longer than FINGERPRINT_BYTES are stored as
+    8-byte fingerprints instead, which keeps every row small; the rare
+    fingerprint hit is confirmed against the wordlist itself. A lookup
+    only reads the bucket matching the target's length and
+    binary-searches it by row number.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, self.mtime_ns, self.source_size = (
+            _BUCKET_HEADER.unpack_from(self._mm)
+        )
+        if magic != _BUCKET_MAGIC:
+            self._mm.close()
+            raise ValueError(f"Not a bucket index: {path}")
+
+        # width -> (row count, rows start, offsets view)
+        self._view = memoryview(self._mm)
+        self._buckets = {}
+        for i in range(count):
+            width, rows, start = _BUCKET_ENTRY.unpack_from(
+                self._mm, _BUCKET_HEADER.size + i * _BUCKET_ENTRY.size
+            )
+            offs_start = _align8(start + _row_size(width) * rows)
+            if offs_start + 8 * rows > self._mm.size():
+                self.close()
+                raise ValueError(f"Truncated bucket index: {path}")
+            offsets = self._view[offs_start:offs_start + 8 * rows].cast("Q")
+            self._buckets[width] = (rows, start, offsets)
+
+    def find(self, word, wordlist_mm):
+        """
+        Return the offset of the first line equal to `word` in the
+        mapped wordlist, or None if it is not present.
+        """
+        bucket = self._buckets.get(len(word))
+        if bucket is None:
+            return None
+
+        rows, start, offsets = bucket
+        size = _row_size(len(word))
+        key = word if size == len(word) else fingerprint(word)
+        mm = self._mm
+        lo, hi = 0, rows
+        while lo < hi:
+            mid = (lo + hi) // 2
+            at = start + mid * size
+            if mm[at:at + size] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+
+        # Rows are sorted by (key, offset): walk equal keys in file order
+        while lo < rows and mm[start + lo * size:start + lo * size + size] == key:
+            # Plain rows are the word itself; fingerprints need confirming
+            if size == len(word) or line_equals(wordlist_mm, offsets[lo], word):
+                return offsets[lo]
+            lo += 1
+        return None
+
+    def close(self):
+        for _, _, offsets in self._buckets.values():
+            offsets.release()
+        self._view.release()
+        self._mm.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def _align8(n):
+    """Round up to the next multiple of 8 (offset arrays are uint64)."""
+    return (n + 7) & ~7
+
+
+def _iter_records(spill, start, count, size):
+    """
+    Yield `count` fixed-size records from a spilled sorted run, reading
+    the shared spill file one block at a time.
+    """
+    per_block = max(1, MERGE_READ_BYTES // size)
+    while count > 0:
+        n = min(count, per_block)
+        spill.seek(start)
+        block = spill.read(n * size)
+        for at in range(0, n * size, size):
+            yield block[at:at + size]
+        start += n * size
+        count -= n
+
+
+def build_bucket_index(wordlist_path, mm, stat, keep_going):
+    """
+    Split the wordlist into per-length buckets of sorted fixed-width rows
+    (fingerprints for long words) and persist them with the matching
+    line offsets.
+
+    Uses an external merge sort so memory stays bounded by one chunk:
+    each BUILD_CHUNK_BYTES of the wordlist is sorted into runs spilled
+    to a temp file, then the runs of every bucket are merged straight
+    into the index file.
+
+    Args:
+        keep_going: Callable polled between chunks; the build raises
+            BuildAborted when it returns False.
+
+    Returns:
+        Path of the written index file.
+    """
+    advise_sequential(mm)
+    path = index_path(wordlist_path, ".bkt")
+    folder = os.path.dirname(path)
+    os.makedirs(folder, exist_ok=True)
+
+    with tempfile.TemporaryFile(dir=folder) as spill, \
+            tempfile.TemporaryFile(dir=folder) as offsets_spill:
+        # ---- Pass 1: sorted runs, one per chunk and bucket ----
+        # Records are key + big-endian offset, so byte order sorts them
+        # by (key, offset) and equal words stay in file order
+        segments = {}  # width -> [(spill position, record count)]
+        pos = 0
+        for chunk_lines in iter_line_chunks(mm):
+            if not keep_going():
+                raise BuildAborted(wordlist_path)
+            run = {}
+            for line in chunk_lines:
+                key = line if len(line) <= FINGERPRINT_BYTES else fingerprint(line)
+                run.setdefault(len(line), []).append(key + pos.to_bytes(8, "big"))
+                # splitlines() drops the terminator; step over "\n" or "\r\n"
+                pos += len(line)
+                pos += 2 if mm[pos:pos + 2] == b"\r\n" else 1
+            for width, records in run.items():
+                records.sort()
+                segments.setdefault(width, []).append((spill.tell(), len(records)))
+                spill.write(b"".join(records))
+            del run
+        spill.flush()
+
+        # ---- Layout: header, directory, then rows + padding + offsets ----
+        data_start = _BUCKET_HEADER.size + len(segments) * _BUCKET_ENTRY.size
+        at = _align8(data_start)
+        directory = []
+        for width in sorted(segments):
+            count = sum(n for _, n in segments[width])
+            directory.append(_BUCKET_ENTRY.pack(width, count, at))
+            at = _align8(at + _row_size(width) * count) + 8 * count
+
+        # ---- Pass 2: merge each bucket's runs into the index ----
+        with _atomic_file(path) as f:
+            f.write(_BUCKET_HEADER.pack(
+                _BUCKET_MAGIC, len(directory), stat.st_mtime_ns, stat.st_size
+            ))
+            for entry in directory:
+                f.write(entry)
+            f.write(b"\0" * (_align8(data_start) - data_start))
+
+            for width in sorted(segments):
+                size = _row_size(width)
+                merged = heapq.merge(*(
+                    _iter_records(spill, start, count, size + 8)
+                    for start, count in segments[width]
+                ))
+
+                # Rows go straight to the index; offsets are staged and
+                # appended once the bucket's rows are complete
+                offsets_spill.seek(0)
+                offsets_spill.truncate()
+                rows, offsets, written = bytearray(), array("Q"), 0
+                for n, record in enumerate(merged, 1):
+                    rows += record[:size]
+                    offsets.append(int.from_bytes(record[size:], "big"))
+                    if n % MERGE_FLUSH_RECORDS == 0:
+                        if not keep_going():
+                            raise BuildAborted(wordlist_path)
+                        f.write(rows)
+                        offsets_spill.write(offsets.tobytes())
+                        written += len(rows)
+                        rows, offsets = bytearray(), array("Q")
+                f.write(rows)
+                offsets_spill.write(offsets.tobytes())
+                written += len(rows)
+
+                f.write(b"\0" * (_align8(written) - written))
+                offsets_spill.seek(0)
+                shutil.copyfileobj(offsets_spill, f)
+    return path
+
+
+def open_bucket_index(wordlist_path, stat):
+    """
+    Open the bucket index for a wordlist.
+
+    Returns:
+        BucketIndex, or None if it is missing or older than the wordlist
+        (see build_bucket_index).
+    """
+    return _open_current(BucketIndex, wordlist_path, ".bkt", stat)